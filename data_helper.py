@@ -36,10 +36,19 @@ The author and anyone associated with the code is not responsible for any financ
 """
 
 import os
-import glob
+import json
+from concurrent.futures import ThreadPoolExecutor
 
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
+from datetime import timedelta
+
+# Bitcoin halving dates, sorted and built once for every lookup
+_HALVING_DATES = pd.DatetimeIndex(['2012-11-28', '2016-07-09', '2020-05-11', '2024-05-12', '2028-05-12'])
+_HALVING_YEARS = _HALVING_DATES.year.to_numpy()
+
+# Bump whenever the cached columns or dtypes change, so existing Parquet snapshots are rebuilt
+_CACHE_VERSION = 2
 
 
 class DataHelper:
@@ -49,65 +58,122 @@ class DataHelper:
         self.data_dir = data_dir
 
     def fetch_historical_data(self):
-        file_pattern = os.path.join(self.data_dir, f"{self.symbol}-{self.timeframe}-*.csv")
-        csv_files = glob.glob(file_pattern)
-        sorted_csv_files = sorted(csv_files)
-
-        df_list = []
-        for csv_file in sorted_csv_files:
+        # Match files on their names straight from the directory entries, without fnmatch
+        prefix = f"{self.symbol}-{self.timeframe}-"
+        with os.scandir(self.data_dir) as entries:
+            sorted_csv_files = sorted(entry.path for entry in entries
+                                      if entry.name.startswith(prefix) and entry.name.endswith('.csv'))
+
+        # Reuse the Parquet snapshot only if it was built from exactly these files with the current schema
+        cache_file = os.path.join(self.data_dir, f"{self.symbol}-{self.timeframe}.parquet")
+        manifest_file = os.path.join(self.data_dir, f"{self.symbol}-{self.timeframe}.parquet.json")
+        manifest = self._cache_manifest(sorted_csv_files)
+        if os.path.exists(cache_file) and self._read_cache_manifest(manifest_file) == manifest:
+            return pd.read_parquet(cache_file, engine='pyarrow')
+
+        # CSV parsing releases the GIL, so the files are read concurrently and concatenated once
+        with ThreadPoolExecutor() as executor:
+            df_list = [df for df in executor.map(self._read_csv_file, sorted_csv_files) if df is not None]
+
+        # Convert the epoch milliseconds once on the concatenated column instead of per file
+        df = pd.concat(df_list, ignore_index=True)
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+
+        # Never cache a partial load, so a file that failed to parse is retried on the next run
+        if len(df_list) == len(sorted_csv_files):
             try:
-                df = pd.read_csv(csv_file)
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-                df_list.append(df)
+                if os.path.exists(manifest_file):
+                    os.remove(manifest_file)
+                df.to_parquet(cache_file, engine='pyarrow', compression='zstd')
+                with open(manifest_file, 'w') as f:
+                    json.dump(manifest, f)
             except Exception as e:
-                print(f"Error processing file {csv_file}: {e}")
-
-        return pd.concat(df_list, ignore_index=True)
+                print(f"Error writing cache file {cache_file}: {e}")
+
+        return df
+
+    def _cache_manifest(self, csv_files):
+        files = []
+        for csv_file in csv_files:
+            stat = os.stat(csv_file)
+            files.append([os.path.basename(csv_file), stat.st_mtime_ns, stat.st_size])
+        return {'version': _CACHE_VERSION, 'files': files}
+
+    def _read_cache_manifest(self, manifest_file):
+        try:
+            with open(manifest_file) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _read_csv_file(self, csv_file):
+        # Prices and volumes fit comfortably in float32, halving the memory traffic of later rolling passes
+        dtypes = {'timestamp': 'int64', 'open': 'float32', 'high': 'float32', 'low': 'float32',
+                  'close': 'float32', 'volume': 'float32'}
+        try:
+            return pd.read_csv(csv_file, engine='pyarrow', dtype=dtypes)
+        except Exception as e:
+            print(f"Error processing file {csv_file}: {e}")
+            return None
 
     def get_halving_date(self, year):
-        halving_dates = self.halving_dates()
-        for date in halving_dates:
-            if date.year == year:
-                return date
-        raise ValueError(f"No halving date found for the year {year}")
+        matches = _HALVING_DATES[_HALVING_YEARS == year]
+        if len(matches) == 0:
+            raise ValueError(f"No halving date found for the year {year}")
+        return matches[0]
 
     def halving_dates(self):
-        return [datetime(2012, 11, 28), datetime(2016, 7, 9), datetime(2020, 5, 11), datetime(2024, 5, 12),
-                datetime(2028, 5, 12)]
+        return _HALVING_DATES
 
     def days_since_last_halving(self, current_date):
-        halving_dates = self.halving_dates()
-        past_halvings = [date for date in halving_dates if date < current_date]
-        if not past_halvings:
+        idx = _HALVING_DATES.searchsorted(current_date, side='left')
+        if idx == 0:
             return 0
-        last_halving = max(past_halvings)
+        last_halving = _HALVING_DATES[idx - 1]
         return (current_date - last_halving).days
 
-    def generate_future_features(self, data, features, days=90):
-        # Get the last known value for each feature
-        last_values = data[features].iloc[-1]
+    def days_since_last_halving_series(self, timestamps):
+        # Sorted halving dates, looked up for every timestamp at once instead of per row
+        halvings = _HALVING_DATES.to_numpy()
+        ts = timestamps.to_numpy(dtype='datetime64[ns]')
+
+        # Index of the last halving strictly before each timestamp (-1 when there is none)
+        idx = np.searchsorted(halvings, ts, side='left') - 1
+        last_halving = np.where(idx >= 0, halvings[idx.clip(0)], ts)
+
+        days = (ts - last_halving) // np.timedelta64(1, 'D')
+        return pd.Series(days.astype(np.int64), index=timestamps.index)
 
-        # Calculate historical percentage changes
-        pct_changes = data['close'].pct_change().dropna()
+    def _avg_pct_change_at_ath(self, data):
+        # Calculate historical percentage changes, forward-filling missing closes like pct_change
+        close = data['close'].to_numpy(dtype=np.float64)
+        filled_close = data['close'].ffill().to_numpy(dtype=np.float64)
+        pct_changes = np.diff(filled_close) / filled_close[:-1]
 
-        # Focus on percentage changes around all-time highs (e.g., within 5% of the max price)
-        all_time_high = data['close'].max()
+        # Focus on percentage changes around all-time highs (e.g., within 5% of the max price),
+        # aligning each change with the close it ends on
+        all_time_high = np.nanmax(close)
         threshold = all_time_high * 0.05
-        at_high_pct_changes = pct_changes[data['close'] > (all_time_high - threshold)]
+        at_high_pct_changes = pct_changes[close[1:] > (all_time_high - threshold)]
 
         # Calculate the average percentage change around all-time highs
-        avg_pct_change_at_high = at_high_pct_changes.mean()
+        return np.nanmean(at_high_pct_changes)
 
-        # Create a DataFrame to hold future feature values
-        future_data = pd.DataFrame(
-            index=pd.date_range(start=data['timestamp'].iloc[-1] + timedelta(days=1), periods=days))
+    def generate_future_features(self, data, features, days=90):
+        # Get the last known value for each feature
+        last_values = data[features].iloc[-1]
+
+        # Calculate the average percentage change around all-time highs
+        avg_pct_change_at_high = self._avg_pct_change_at_ath(data)
+
+        # Compound growth factors for every future day in one vectorized power
+        factors = (1.0 + avg_pct_change_at_high) ** np.arange(days)
 
-        # Generate future feature values using the average percentage change
-        for feature in features:
-            future_values = [last_values[feature]]
-            for _ in range(1, days):
-                future_values.append(future_values[-1] * (1 + avg_pct_change_at_high))
-            future_data[feature] = future_values
+        # Generate future feature values by broadcasting the factors over the last known values
+        future_data = pd.DataFrame(
+            last_values.to_numpy(dtype=np.float64)[None, :] * factors[:, None],
+            index=pd.date_range(start=data['timestamp'].iloc[-1] + timedelta(days=1), periods=days),
+            columns=features)
 
         return future_data
 
@@ -122,26 +188,16 @@ class DataHelper:
         # Calculate the number of days to the halving date
         days_to_halving = (halving_date - last_known_date).days
 
-        # Calculate historical percentage changes
-        pct_changes = data['close'].pct_change().dropna()
-
-        # Focus on percentage changes around all-time highs (for example)
-        all_time_high = data['close'].max()
-        threshold = all_time_high * 0.05
-        at_high_pct_changes = pct_changes[data['close'] > (all_time_high - threshold)]
-
         # Calculate the average percentage change around all-time highs
-        avg_pct_change_at_high = at_high_pct_changes.mean()
+        avg_pct_change_at_high = self._avg_pct_change_at_ath(data)
+
+        # Compound growth factors for every day up to the halving in one vectorized power
+        factors = (1.0 + avg_pct_change_at_high) ** np.arange(days_to_halving)
 
-        # Create a DataFrame to hold future feature values
+        # Generate future feature values by broadcasting the factors over the last known values
         future_data = pd.DataFrame(
-            index=pd.date_range(start=last_known_date + timedelta(days=1), periods=days_to_halving))
-
-        # Generate future feature values using the average percentage change
-        for feature in features:
-            future_values = [last_values[feature]]
-            for _ in range(1, days_to_halving):
-                future_values.append(future_values[-1] * (1 + avg_pct_change_at_high))
-            future_data[feature] = future_values
+            last_values.to_numpy(dtype=np.float64)[None, :] * factors[:, None],
+            index=pd.date_range(start=last_known_date + timedelta(days=1), periods=days_to_halving),
+            columns=features)
 
         return future_data
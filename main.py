@@ -60,9 +60,6 @@ Fetch historical Bitcoin price data, convert timestamps, and calculate volatilit
 data = DataHelper('btcusd', 'd1')
 btc_data = data.fetch_historical_data()
 
-# Convert timestamp to datetime format
-btc_data['timestamp'] = pd.to_datetime(btc_data['timestamp'], unit='ms')
-
 # Check if 'high' and 'low' columns exist for volatility calculation
 if 'high' in btc_data.columns and 'low' in btc_data.columns:
     btc_data['volatility'] = btc_data['high'] - btc_data['low']
@@ -71,7 +68,7 @@ else:
 
 # Fetch Bitcoin halving dates and calculate days since the last halving
 halving_dates = data.halving_dates()
-btc_data['days_since_halving'] = btc_data['timestamp'].apply(lambda x: data.days_since_last_halving(x))
+btc_data['days_since_halving'] = data.days_since_last_halving_series(btc_data['timestamp'])
 
 """
 ## Estimating Future Bitcoin Prices
@@ -82,8 +79,8 @@ Predict future Bitcoin prices by simulating consistent growth near all-time high
 # Get the last date from the data
 last_date = btc_data['timestamp'].iloc[-1]
 
-# Generate future dates (5 years)
-future_dates = [last_date + timedelta(days=i) for i in range(1, 365 * 7 + 1)]
+# Generate future dates (7 years)
+future_dates = pd.date_range(start=last_date + timedelta(days=1), periods=365 * 7, freq='D')
 
 # Calculate all-time high price and define a threshold for 'near all-time high' periods
 max_historical_price = btc_data['close'].max()
@@ -98,14 +95,8 @@ ath_average_volatility = near_ath_data['volatility'].mean()
 # Assume a small positive increment for consistent growth
 increment = ath_average_volatility * 0.1  # Adjust this factor to control the optimism level
 
-# Apply the increment to estimate future prices
-estimated_future_prices = [max_historical_price]
-
-for _ in range(1, 365 * 7):
-    # Consistently add the small increment
-    estimated_future_prices.append(estimated_future_prices[-1] + increment)
-
-estimated_future_prices = pd.Series(estimated_future_prices,
+# Apply the increment to estimate future prices (consistent growth is an arithmetic progression)
+estimated_future_prices = pd.Series(max_historical_price + increment * np.arange(365 * 7),
                                     index=pd.date_range(start=btc_data['timestamp'].iloc[-1], periods=365 * 7,
                                                         freq='D'))
 last_price = estimated_future_prices.iloc[-1]
@@ -120,19 +111,15 @@ Perform technical analysis and calculate indicators.
 btc_data['open_ma_7'] = btc_data['open'].rolling(window=7).mean()
 
 # Calculate the Relative Strength Index (RSI)
-btc_data['rsi'] = TechnicalAnalysis().relative_strength_idx(btc_data)
-
-# Create lagged close price features
-for lag in [1, 3, 7, 14, 30]:
-    btc_data[f'lagged_close_{lag}'] = btc_data['close'].shift(lag)
+btc_data['rsi'] = TechnicalAnalysis.relative_strength_idx(btc_data)
 
-# Calculate rolling mean and standard deviation for different windows
-for window in [7, 14, 30]:
-    btc_data[f'rolling_mean_{window}'] = btc_data['close'].rolling(window=window).mean()
-    btc_data[f'rolling_std_{window}'] = btc_data['close'].rolling(window=window).std()
+# Create lagged close price features and rolling mean/standard deviation for different windows in one pass
+for name, values in TechnicalAnalysis.rolling_features(btc_data, windows=(7, 14, 30),
+                                                        lags=(1, 3, 7, 14, 30)).items():
+    btc_data[name] = values
 
-# Drop rows with missing values and reset the index
-btc_data = btc_data.dropna().reset_index(drop=True)
+# Drop the warm-up rows of the longest rolling and lag windows and reset the index
+btc_data = btc_data.dropna(subset=['rolling_std_30', 'lagged_close_30']).reset_index(drop=True)
 
 """
 ## Plotting Bitcoin Price Data
@@ -168,26 +155,25 @@ plt.annotate(f'${last_price:,.2f}',  # Format the price as a string
              fontsize=12, color='white')
 
 # Annotate prices at the start of each new year
-prev_year = future_dates[0].year
-
-for i in range(len(future_dates)):
-    current_year = future_dates[i].year
-    if current_year != prev_year:
-        # Annotate the price at the start of the new year
-        plt.annotate(f'{current_year}\n${estimated_future_prices[i]:,.2f}',
-                     xy=(future_dates[i], estimated_future_prices[i]),
-                     xytext=(future_dates[i] + timedelta(days=30), estimated_future_prices[i]),
-                     arrowprops=dict(facecolor='white', arrowstyle='->'),
-                     fontsize=10, color='white',
-                     horizontalalignment='right')
-        prev_year = current_year
-
-# Add vertical lines for Bitcoin halving dates
+future_years = future_dates.year.to_numpy()
+new_year_indices = np.flatnonzero(np.diff(future_years)) + 1
+
+for i in new_year_indices:
+    # Annotate the price at the start of the new year
+    plt.annotate(f'{future_years[i]}\n${estimated_future_prices.iloc[i]:,.2f}',
+                 xy=(future_dates[i], estimated_future_prices.iloc[i]),
+                 xytext=(future_dates[i] + timedelta(days=30), estimated_future_prices.iloc[i]),
+                 arrowprops=dict(facecolor='white', arrowstyle='->'),
+                 fontsize=10, color='white',
+                 horizontalalignment='right')
+
+# Add vertical lines for Bitcoin halving dates (vertical lines do not change the y-axis limits)
+y_max = plt.ylim()[1]
 for halving_date in halving_dates:
     plt.axvline(x=halving_date, color='red', linestyle='--', linewidth=2)
     plt.annotate(f'Halving {halving_date.strftime("%Y-%m-%d")}',
-                 xy=(halving_date, plt.ylim()[1]),
-                 xytext=(halving_date, plt.ylim()[1] * 0.6),
+                 xy=(halving_date, y_max),
+                 xytext=(halving_date, y_max * 0.6),
                  arrowprops=dict(facecolor='white', arrowstyle='->', connectionstyle='arc3,rad=-0.2'),
                  fontsize=12, color='white', horizontalalignment='right')
 
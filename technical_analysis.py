@@ -35,20 +35,141 @@ The author and anyone associated with the code is not responsible for any financ
 
 """
 
+import numba
 import numpy as np
 import pandas as pd
 
 
+@numba.njit(cache=True)
+def _rsi(close, n):
+    size = close.shape[0]
+    rsi = np.full(size, 50.0)  # Neutral RSI value of 50 during warm-up
+    gain = np.zeros(size)
+    loss = np.zeros(size)
+    sum_gain = 0.0
+    sum_loss = 0.0
+    gain_count = 0
+    loss_count = 0
+    for i in range(size):
+        if i > 0:
+            delta = close[i] - close[i - 1]
+            if delta > 0:
+                gain[i] = delta
+                gain_count += 1
+            elif delta < 0:
+                loss[i] = -delta
+                loss_count += 1
+
+        # Keep running window sums by adding the newest value and dropping the oldest
+        sum_gain += gain[i]
+        sum_loss += loss[i]
+        if i >= n:
+            sum_gain -= gain[i - n]
+            sum_loss -= loss[i - n]
+            if gain[i - n] > 0:
+                gain_count -= 1
+            if loss[i - n] > 0:
+                loss_count -= 1
+
+        # Clear the rounding residue once a window holds no gains or no losses
+        if gain_count == 0:
+            sum_gain = 0.0
+        if loss_count == 0:
+            sum_loss = 0.0
+
+        if i >= n - 1:
+            avg_gain = sum_gain / n
+            avg_loss = sum_loss / n
+            if avg_loss > 0:
+                rsi[i] = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+            elif avg_gain > 0:
+                rsi[i] = 100.0
+    return rsi
+
+
+@numba.njit(cache=True)
+def _rolling_features(close, windows, lags):
+    size = close.shape[0]
+    means = np.full((windows.shape[0], size), np.nan)
+    stds = np.full((windows.shape[0], size), np.nan)
+    lagged = np.full((lags.shape[0], size), np.nan)
+
+    # Per-window running count, mean and sum of squared deviations (Welford add/remove)
+    count = np.zeros(windows.shape[0], dtype=np.int64)
+    nan_count = np.zeros(windows.shape[0], dtype=np.int64)
+    mean = np.zeros(windows.shape[0])
+    m2 = np.zeros(windows.shape[0])
+
+    # Length of the current run of identical closes (NaN never compares equal)
+    same_run = 0
+
+    for i in range(size):
+        x = close[i]
+        if np.isnan(x):
+            same_run = 0
+        elif i > 0 and x == close[i - 1]:
+            same_run += 1
+        else:
+            same_run = 1
+
+        for k in range(windows.shape[0]):
+            w = windows[k]
+            if np.isnan(x):
+                nan_count[k] += 1
+            else:
+                count[k] += 1
+                delta = x - mean[k]
+                mean[k] += delta / count[k]
+                m2[k] += delta * (x - mean[k])
+
+            if i >= w:
+                old = close[i - w]
+                if np.isnan(old):
+                    nan_count[k] -= 1
+                else:
+                    count[k] -= 1
+                    if count[k] == 0:
+                        mean[k] = 0.0
+                        m2[k] = 0.0
+                    else:
+                        delta = old - mean[k]
+                        mean[k] -= delta / count[k]
+                        m2[k] -= delta * (old - mean[k])
+
+            # Clear the rounding residue once every value in the window is the same
+            if same_run >= w:
+                mean[k] = x
+                m2[k] = 0.0
+
+            if i >= w - 1 and nan_count[k] == 0:
+                means[k, i] = mean[k]
+                if w > 1:
+                    stds[k, i] = np.sqrt(max(m2[k], 0.0) / (w - 1))
+
+        for k in range(lags.shape[0]):
+            if i >= lags[k]:
+                lagged[k, i] = close[i - lags[k]]
+
+    return means, stds, lagged
+
+
 class TechnicalAnalysis:
 
-    def relative_strength_idx(self, df, n=14):
-        self.df = df
-        self.n = n
-        delta = df['close'].diff()
-        gain = np.where(delta > 0, delta, 0)
-        loss = np.where(delta < 0, -delta, 0)
-        avg_gain = pd.Series(gain).rolling(window=n).mean()
-        avg_loss = pd.Series(loss).rolling(window=n).mean()
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        return rsi.fillna(50)  # Fill NaN with neutral RSI value of 50
+    @staticmethod
+    def rolling_features(df, windows=(7, 14, 30), lags=(1, 3, 7, 14, 30)):
+        means, stds, lagged = _rolling_features(df['close'].to_numpy(dtype=np.float64),
+                                                np.asarray(windows, dtype=np.int64),
+                                                np.asarray(lags, dtype=np.int64))
+        # Accumulate in float64 for a stable rolling variance, store the results as float32
+        features = {}
+        for k, lag in enumerate(lags):
+            features[f'lagged_close_{lag}'] = lagged[k].astype(np.float32)
+        for k, window in enumerate(windows):
+            features[f'rolling_mean_{window}'] = means[k].astype(np.float32)
+            features[f'rolling_std_{window}'] = stds[k].astype(np.float32)
+        return features
+
+    @staticmethod
+    def relative_strength_idx(df, n=14):
+        rsi = _rsi(df['close'].to_numpy(dtype=np.float64), n)
+        return pd.Series(rsi, index=df.index)